@@ -6,6 +6,19 @@ from nansat.exceptions import WrongMapperError
 from nansat.vrt import VRT
 
 
+def _nan_filled(var):
+    """Read a netCDF4 variable and return the data with masked values
+    set to NaN. The mask is applied in place on the data buffer, to
+    avoid the copy made by MaskedArray.filled.
+    """
+    data = var[:]
+    if not np.ma.is_masked(data):
+        return np.ma.getdata(data)
+    values = data.data
+    values[data.mask] = np.nan
+    return values
+
+
 class Mapper(VRT):
 
     def __init__(self, filename, gdal_dataset, metadata, *args, **kwargs):
@@ -14,80 +27,46 @@ class Mapper(VRT):
             ds = netCDF4.Dataset(filename)
         except OSError:
             raise WrongMapperError
-        if "title" not in ds.ncattrs():
+        global_attrs = ds.__dict__
+        if "title" not in global_attrs:
             raise WrongMapperError
         else:
-            if "urface wind" not in ds.title or "NRCS" not in ds.title:
+            if "urface wind" not in global_attrs["title"] or "NRCS" not in global_attrs["title"]:
                 raise WrongMapperError
-        for var, val in ds.variables.items():
-            if "standard_name" in ds[var].ncattrs():
-                if val.standard_name == "longitude":
-                    lon = var
-                if val.standard_name == "latitude":
-                    lat = var
+        lon = None
+        lat = None
+        for name, var in ds.variables.items():
+            if "standard_name" not in var.ncattrs():
+                continue
+            if var.standard_name == "longitude":
+                lon = name
+            elif var.standard_name == "latitude":
+                lat = name
+            if lon is not None and lat is not None:
+                break
+        if lon is None or lat is None:
+            raise WrongMapperError
         longitude = ds[lon][:].data
         latitude = ds[lat][:].data
-        for attr in ds.ncattrs():
-            content = ds.getncattr(attr)
-            metadata[attr] = content
+        metadata.update(global_attrs)
         super(Mapper, self)._init_from_lonlat(longitude, latitude)
 
         # Get rid of GDAL additions to metadata keys
         metadata = VRT._remove_strings_in_metadata_keys(metadata, ['NC_GLOBAL#', 'GDAL_'])
         self.dataset.SetMetadata(metadata)
-        self.band_vrts = {
-            "wind_direction": VRT.from_array(ds["wind_direction"][:].filled(fill_value=np.nan)),
-            "look_relative_wind_direction": VRT.from_array(
-                ds["look_relative_wind_direction"][:].filled(fill_value=np.nan)),
-            "windspeed": VRT.from_array(ds["windspeed"][:].filled(fill_value=np.nan)),
-            "model_windspeed": VRT.from_array(ds["model_windspeed"][:].filled(fill_value=np.nan)),
-        }
-
+        self.band_vrts = {}
         metaDict = []
-
-        wdir_metadict = {}
-        for attr in ds["wind_direction"].ncattrs():
-            wdir_metadict[attr] = ds["wind_direction"].getncattr(attr)
-        metaDict.append({
-            'src': {
-                'SourceFilename': self.band_vrts["wind_direction"].filename,
-                'SourceBand': 1
-            },
-            'dst': wdir_metadict,
-        })
-
-        lookrel_metadict = {}
-        for attr in ds["look_relative_wind_direction"].ncattrs():
-            lookrel_metadict[attr] = ds["look_relative_wind_direction"].getncattr(attr)
-        metaDict.append({
-            'src': {
-                'SourceFilename': self.band_vrts["look_relative_wind_direction"].filename,
-                'SourceBand': 1
-            },
-            'dst': lookrel_metadict,
-        })
-
-        wspeed_metadict = {}
-        for attr in ds["windspeed"].ncattrs():
-            wspeed_metadict[attr] = ds["windspeed"].getncattr(attr)
-        metaDict.append({
-            'src': {
-                'SourceFilename': self.band_vrts["windspeed"].filename,
-                'SourceBand': 1
-            },
-            'dst': wspeed_metadict,
-        })
-
-        mwspeed_metadict = {}
-        for attr in ds["model_windspeed"].ncattrs():
-            mwspeed_metadict[attr] = ds["model_windspeed"].getncattr(attr)
-        metaDict.append({
-            'src': {
-                'SourceFilename': self.band_vrts["model_windspeed"].filename,
-                'SourceBand': 1
-            },
-            'dst': mwspeed_metadict,
-        })
+        for band in ("wind_direction", "look_relative_wind_direction", "windspeed",
+                     "model_windspeed"):
+            var = ds[band]
+            self.band_vrts[band] = VRT.from_array(_nan_filled(var))
+            metaDict.append({
+                'src': {
+                    'SourceFilename': self.band_vrts[band].filename,
+                    'SourceBand': 1
+                },
+                'dst': var.__dict__,
+            })
 
         self.create_bands(metaDict)
 
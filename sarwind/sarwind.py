@@ -3,8 +3,8 @@
              (https://github.com/metno/met-sar-vind/blob/main/LICENSE).
 """
 import os
-import pytz
 import uuid
+import hashlib
 import netCDF4
 import logging
 import datetime
@@ -16,6 +16,58 @@ from nansat.nansat import Nansat
 from sarwind.cmod5n import cmod5n_inverse
 
 
+# Platform and instrument names of the supported SAR missions
+_PLATFORMS = {
+    "S1A": ["Sentinel-1A", "SAR-C"],
+    "S1B": ["Sentinel-1B", "SAR-C"],
+}
+
+# Default values of the global metadata that do not depend on the
+# dataset. They can be replaced by the user (see
+# SARWind.set_get_standard_metadata).
+_DEFAULT_METADATA = {
+    "summary": (
+        "Surface wind speed (10 m above sea level) calculated from C-band Synthetic Aperture "
+        "Radar (SAR) Normalized Radar Cross Section (NRCS) and model forecast wind, using "
+        "CMOD5n. The wind speed is calculated for neutrally stable conditions and is "
+        "equivalent to the wind stress."),
+    "summary_no": (
+        "Overflatevind (10 moh) beregnet fra SAR C-bånd tilbakespredning og vindretning fra "
+        "varslingsmodell, ved bruk av CMOD5n. Vindhastigheten er beregnet under antagelse av "
+        "nøytral atmosfærestabilitet, og er representativ for vindstress."),
+    "license": "https://spdx.org/licenses/CC-BY-4.0 (CC-BY-4.0)",
+    "keywords": (
+        "GCMDSK:EARTH SCIENCE > OCEANS > OCEAN WINDS > SURFACE WINDS > WIND SPEED, "
+        "GCMDSK:EARTH SCIENCE > OCEANS > OCEAN WINDS > WIND STRESS, "
+        "GEMET:Atmospheric conditions, "
+        "NORTHEMES:Vær og klima"),
+    "keywords_vocabulary": (
+        "GCMDSK:GCMD Science Keywords:https://vocab.met.no/GCMDSK, "
+        "GEMET:INSPIRE Themes:http://inspire.ec.europa.eu/theme, "
+        "NORTHEMES:GeoNorge Themes:https://register.geonorge.no/metadata-kodelister/"
+        "nasjonal-temainndeling"),
+    "references": "https://doi.org/10.1029/2006JC003743 (Scientific publication)",
+    "processing_level": "Operational",
+    "naming_authority": "no.met",
+    "publisher_type": "institution",
+    "publisher_email": "data-management-group@met.no",
+    "publisher_url": "https://www.met.no/",
+    "publisher_name": "Norwegian Meteorological Institute",
+    "institution": "Norwegian Meteorological Institute (MET Norway)",
+    "access_constraint": "Open",
+    "dataset_production_status": "Complete",
+    "project": (
+        "Svalbard Integrated Arctic Earth Observing System – Infrastructure development of "
+        "the Norwegian node (SIOS-InfraNor)"),
+    "quality_control": "No quality control",
+}
+
+
+def _parse_iso(timestamp):
+    """Parse an ISO 8601 timestamp, which may end with "Z"."""
+    return datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
 class TimeDiffError(Exception):
     pass
 
@@ -74,20 +126,23 @@ class SARWind(Nansat, object):
                 "polarization": "VV",
                 "dataType": "6"
             })
-        # Check that there is data
-        s0vv = self[self.sigma0_bandNo]
-        if s0vv[~np.isnan(s0vv)].shape[0] == 0:
-            raise ValueError("Erroneous SAR product - all NRCS values are NaN.")
 
         logging.debug("Resize SAR..")
         # Resize to given pixel size (default 500 m)
         self.resize(pixelsize=pixelsize)
 
+        logging.debug("Read sigma0..")
+        # Single precision is sufficient for the NRCS, incidence angle
+        # and wind directions, and halves the memory traffic of the
+        # arithmetic below
+        s0vv = self[self.sigma0_bandNo].astype(np.float32, copy=False)
+        # Check that there is data
+        if np.isnan(s0vv).all():
+            raise ValueError("Erroneous SAR product - all NRCS values are NaN.")
+
         # Get topography
         logging.debug("Get topography..")
-        topo = Nansat(os.getenv("GMTED30"))
-        topo.reproject(self, resample_alg=resample_alg, tps=True)
-        land = topo[1] > 0
+        land = self.get_land_mask(resample_alg=resample_alg)
         if land.all():
             raise ValueError("No SAR NRCS ocean coverage.")
 
@@ -96,22 +151,27 @@ class SARWind(Nansat, object):
             ds = netCDF4.Dataset(sar_image)
         except OSError:
             ds = netCDF4.Dataset(sar_image + "#fillmismatch")
-        self.set_metadata("time_coverage_start", ds.time_coverage_start)
-        self.set_metadata("time_coverage_end", ds.time_coverage_end)
+        with ds:
+            self.set_metadata("time_coverage_start", ds.time_coverage_start)
+            self.set_metadata("time_coverage_end", ds.time_coverage_end)
 
         # Store wind and SAR filenames/urls
         self.set_metadata("wind_filename", wind)
         self.set_metadata("sar_filename", sar_image)
 
+        # The incidence angle is needed both for the polarization
+        # ratio and for CMOD5n
+        inc = self["incidence_angle"].astype(np.float32, copy=False)
+
         # Get VV NRCS
-        logging.debug("Read sigma0..")
-        s0vv = self[self.sigma0_bandNo]
         if self.get_metadata(band_id=self.sigma0_bandNo, key="polarization") == "HH":
-            inc = self["incidence_angle"]
             # PR from Lin Ren, Jingsong Yang, Alexis Mouche, et al. (2017) [remote sensing]
-            PR = np.square(1.+2.*np.square(np.tan(inc*np.pi/180.))) / \
-                np.square(1.+1.3*np.square(np.tan(inc*np.pi/180.)))
-            s0vv = s0vv*PR
+            tan2 = np.tan(np.deg2rad(inc))
+            tan2 *= tan2
+            PR = 1.+2.*tan2
+            PR /= 1.+1.3*tan2
+            PR *= PR
+            s0vv *= PR
 
         # Read and reproject model wind field
         logging.debug("Read model wind..")
@@ -123,18 +183,16 @@ class SARWind(Nansat, object):
                          "time": np.datetime64(self.time_coverage_start)})
 
         # Calculate mean time of the SAR NRCS grid
-        t0 = datetime.datetime.fromisoformat(
-            self.get_metadata("time_coverage_start").replace("Z", "+00:00"))
-        t1 = datetime.datetime.fromisoformat(
-            self.get_metadata("time_coverage_end").replace("Z", "+00:00"))
+        t0 = _parse_iso(self.get_metadata("time_coverage_start"))
+        t1 = _parse_iso(self.get_metadata("time_coverage_end"))
         sar_mean_time = t0 + (t1 - t0)/2
         if sar_mean_time.tzinfo is None:
-            sar_mean_time = pytz.utc.localize(sar_mean_time)
+            sar_mean_time = sar_mean_time.replace(tzinfo=datetime.timezone.utc)
 
         # Check time difference between SAR and model
-        tdiff = np.abs(sar_mean_time - datetime.datetime.fromisoformat(
-            aux.get_metadata(band_id=1, key="time")).replace(tzinfo=pytz.timezone("utc")))
-        if tdiff.seconds/60 > max_diff_minutes:
+        tdiff = np.abs(sar_mean_time - _parse_iso(
+            aux.get_metadata(band_id=1, key="time")).replace(tzinfo=datetime.timezone.utc))
+        if tdiff.total_seconds()/60 > max_diff_minutes:
             raise ValueError("Time difference between model and SAR wind field is greater "
                              "than %s minutes - wind speed cannot be reliably estimated."
                              % max_diff_minutes)
@@ -153,6 +211,7 @@ class SARWind(Nansat, object):
 
         # Get wind speed and direction
         model_wind_speed, wind_from, time = self.get_model_wind_field(aux)
+        wind_from = wind_from.astype(np.float32, copy=False)
 
         # Add longitude and latitude as bands
         try:
@@ -167,6 +226,7 @@ class SARWind(Nansat, object):
         if lon_band_no is None:
             self.add_band(
                 array=lon,
+                nomem=True,
                 parameters={
                     "wkv": "longitude",
                     "name": "longitude",
@@ -175,6 +235,7 @@ class SARWind(Nansat, object):
         if lat_band_no is None:
             self.add_band(
                 array=lat,
+                nomem=True,
                 parameters={
                     "wkv": "latitude",
                     "name": "latitude",
@@ -184,6 +245,7 @@ class SARWind(Nansat, object):
         # Store model wind direction
         self.add_band(
             array=wind_from,
+            nomem=True,
             parameters={
                 "wkv": "wind_from_direction",
                 "name": "wind_direction",
@@ -208,9 +270,13 @@ class SARWind(Nansat, object):
 
         startTime = datetime.datetime.now()
 
-        look_dir = self[self.get_band_number({"standard_name": "sensor_azimuth_angle"})]
-        look_dir[np.isnan(wind_from)] = np.nan
-        look_relative_wind_direction = np.mod(wind_from - look_dir, 360.)
+        look_dir = self[self.get_band_number({"standard_name": "sensor_azimuth_angle"})].astype(
+            np.float32, copy=False)
+        # NaN in wind_from propagates through the difference. The
+        # look direction is not needed afterwards, so its buffer is
+        # reused.
+        look_relative_wind_direction = np.subtract(wind_from, look_dir, out=look_dir)
+        np.mod(look_relative_wind_direction, 360., out=look_relative_wind_direction)
         # Store look relative wind direction
         self.add_band(
             array=look_relative_wind_direction,
@@ -223,19 +289,14 @@ class SARWind(Nansat, object):
 
         # Calculate wind speed
         logging.debug("Calculate SAR wind with CMOD...")
-        windspeed = cmod5n_inverse(s0vv, look_relative_wind_direction,
-                                   self["incidence_angle"])
+        windspeed = self.calculate_wind_speed(s0vv, look_relative_wind_direction, inc, land)
 
         logging.debug("Calculation time: " + str(datetime.datetime.now() - startTime))
 
-        windspeed[np.where(np.isinf(windspeed))] = np.nan
-
-        # Mask land
-        windspeed[topo[1] > 0] = np.nan
-
         # Add wind speed and direction as bands
         self.add_band(
             array=windspeed,
+            nomem=True,
             parameters={
                 "wkv": "wind_speed",
                 "name": "windspeed",
@@ -244,16 +305,25 @@ class SARWind(Nansat, object):
                 "time": sar_mean_time.isoformat(),
             })
 
-        u = -windspeed*np.sin(wind_from * np.pi / 180.0)
-        v = -windspeed*np.cos(wind_from * np.pi / 180.0)
+        # Wind components point in the opposite direction of wind_from
+        wind_from_rad = np.deg2rad(wind_from)
+        neg_windspeed = np.negative(windspeed)
+        u = np.sin(wind_from_rad)
+        u *= neg_windspeed
+        # The radians are not needed after this, so the buffer is
+        # reused for v
+        v = np.cos(wind_from_rad, out=wind_from_rad)
+        v *= neg_windspeed
         self.add_band(
             array=u,
+            nomem=True,
             parameters={
                 "wkv": "eastward_wind",
                 "time": sar_mean_time.isoformat(),
             })
         self.add_band(
             array=v,
+            nomem=True,
             parameters={
                 "wkv": "northward_wind",
                 "time": sar_mean_time.isoformat(),
@@ -267,13 +337,53 @@ class SARWind(Nansat, object):
 
         history = metadata.get("history", "")
         self.set_metadata("swhistory", history + "\n%s: %s(%s, %s)" % (
-            datetime.datetime.utcnow().replace(tzinfo=pytz.timezone("utc")).isoformat(),
+            datetime.datetime.now(datetime.timezone.utc).isoformat(),
             "SARWind",
-            self.get_metadata("sar_filename"),
-            self.get_metadata("wind_filename"))
+            metadata["sar_filename"],
+            metadata["wind_filename"])
         )
         logging.debug("SAR wind field is ready.")
 
+    def get_land_mask(self, resample_alg=1):
+        """Return a boolean land mask on the SAR grid, from the
+        GMTED30 topography reprojected to the SAR grid.
+
+        Reprojecting the global topography is expensive. If the
+        environment variable SARWIND_LANDMASK_CACHE is set to a
+        directory, the mask is stored there, keyed by the SAR grid,
+        and reused when the same grid is processed again. Cached
+        masks are never removed, so the directory grows by one file
+        per SAR grid and must be cleaned up externally.
+        """
+        cache_dir = os.getenv("SARWIND_LANDMASK_CACHE")
+        if cache_dir is not None:
+            # Hash the exact border coordinates, since their string
+            # representation is rounded and may be truncated
+            key = hashlib.sha1(str((os.getenv("GMTED30"), self.shape(),
+                                    resample_alg)).encode())
+            for coordinates in self.get_border():
+                coordinates = np.ascontiguousarray(coordinates)
+                key.update(str((coordinates.dtype.str, coordinates.shape)).encode())
+                key.update(coordinates.tobytes())
+            cache_file = os.path.join(cache_dir, "landmask_%s.npy" % key.hexdigest())
+            if os.path.isfile(cache_file):
+                logging.debug("Read land mask from %s" % cache_file)
+                return np.load(cache_file)
+
+        topo = Nansat(os.getenv("GMTED30"))
+        topo.reproject(self, resample_alg=resample_alg, tps=True)
+        land = topo[1] > 0
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a unique file first, so that concurrent runs
+            # never read a partially written mask
+            tmp_file = os.path.join(cache_dir, "%s.npy" % uuid.uuid4())
+            np.save(tmp_file, land)
+            os.replace(tmp_file, cache_file)
+
+        return land
+
     def set_related_dataset(self, metadata, auxm):
         """Set MMD metadata extension to ACDD. The use of this is
         still unclear and may be changed.
@@ -342,19 +452,45 @@ class SARWind(Nansat, object):
         u = aux["x_wind_10m"]
         v = aux["y_wind_10m"]
         time = aux.get_metadata(band_id="x_wind_10m", key="time")
-        speed = np.sqrt(np.square(u) + np.square(v))
+        speed = np.hypot(u, v)
         dir = SARWind.calculate_wind_from_direction(u, v)
         return speed, dir, time
 
+    @staticmethod
+    def calculate_wind_speed(s0vv, look_relative_wind_direction, inc, land):
+        """ Calculate the wind speed with CMOD5n. The wind speed is
+        NaN over land, and where the NRCS, look relative wind
+        direction or incidence angle is not finite. CMOD5n does not
+        return NaN for such pixels, but the upper bound of its search.
+        """
+        # CMOD5n is only evaluated where the input is valid, and in
+        # the precision of the input, which may be single precision
+        valid = ~land
+        valid &= np.isfinite(s0vv)
+        valid &= np.isfinite(look_relative_wind_direction)
+        valid &= np.isfinite(inc)
+        valid_windspeed = cmod5n_inverse(s0vv[valid], look_relative_wind_direction[valid],
+                                         inc[valid])
+        windspeed = np.full(land.shape, np.nan, dtype=valid_windspeed.dtype)
+        windspeed[valid] = valid_windspeed
+        return windspeed
+
     @staticmethod
     def calculate_wind_from_direction(u, v):
         """ Calculate the wind from direction.
         """
-        return np.mod(180. + np.arctan2(u, v) * 180./np.pi, 360)
+        dir = np.degrees(np.arctan2(u, v))
+        dir += 180.
+        return np.mod(dir, 360.)
 
     def export(self, filename=None, bands=None, metadata=None, to_thredds=False, *args, **kwargs):
         """ Export dataset with only wind data to NetCDF-CF, and add
-        custom metadata.
+        custom metadata. By default, the output is written as NetCDF-4
+        with deflate compression (GDAL creation options "FORMAT=NC4",
+        "COMPRESS=DEFLATE" and "ZLEVEL=4"). GDAL creation options given
+        in the options keyword argument, either as a string or a list,
+        replace these defaults entirely, so compression must then be
+        requested explicitly.
         """
         if metadata is None:
             # Necessary to avoid problems when export2thredds calls
@@ -399,9 +535,10 @@ class SARWind(Nansat, object):
             bands_dict["wind_direction"]["colormap"] = "cmocean.cm.phase"
             bands_dict["look_relative_wind_direction"]["colormap"] = "cmocean.cm.phase"
             super().export2thredds(filename, bands=bands_dict,
-                                   time=datetime.datetime.fromisoformat(
-                                       metadata["time_coverage_start"]))
+                                   time=_parse_iso(metadata["time_coverage_start"]))
         else:
+            # Compress the output unless other GDAL options are given
+            kwargs.setdefault("options", ["FORMAT=NC4", "COMPRESS=DEFLATE", "ZLEVEL=4"])
             super().export(filename, bands=bands, add_geolocation=False, add_gcps=False, *args,
                            **kwargs)
 
@@ -413,27 +550,28 @@ class SARWind(Nansat, object):
         for key in pop_keys:
             metadata.pop(key)
 
-        # Set metadata from dict
-        nc_ds = netCDF4.Dataset(filename, "a")
-        if metadata is not None:
-            for att in nc_ds.ncattrs():
-                nc_ds.delncattr(att)
-            nc_ds.setncatts(metadata)
-
-        # Clean variable metadata
         md_rm = ["dataType", "SourceBand", "SourceFilename", "wkv", "PixelFunctionType"]
-        for key in nc_ds.variables.keys():
-            for md_key in md_rm:
-                if md_key in nc_ds[key].ncattrs():
-                    nc_ds[key].delncattr(md_key)
-
-        # Remove wrong metadata
         sn = "standard_name"
-        if swath_mask_band in nc_ds.variables.keys():
-            if sn in nc_ds[swath_mask_band].ncattrs():
-                nc_ds["swathmask"].delncattr(sn)
-
-        nc_ds.close()
+        # Update global and variable metadata in one append session,
+        # which is closed also if an update fails
+        with netCDF4.Dataset(filename, "a") as nc_ds:
+            # Set metadata from dict
+            if metadata is not None:
+                for att in nc_ds.ncattrs():
+                    nc_ds.delncattr(att)
+                nc_ds.setncatts(metadata)
+
+            # Clean variable metadata
+            for var in nc_ds.variables.values():
+                var_attrs = var.ncattrs()
+                for md_key in md_rm:
+                    if md_key in var_attrs:
+                        var.delncattr(md_key)
+
+            # Remove wrong metadata
+            if swath_mask_band in nc_ds.variables.keys():
+                if sn in nc_ds[swath_mask_band].ncattrs():
+                    nc_ds[swath_mask_band].delncattr(sn)
 
     def to_model_projection(self):
         """Reproject SAR wind field dataset to model grid mapping.
@@ -447,7 +585,7 @@ class SARWind(Nansat, object):
         self.vrt.dataset.SetMetadata({})
         self.reproject(model)
         # Update history
-        time = datetime.datetime.utcnow().replace(tzinfo=pytz.timezone("utc")).isoformat()
+        time = datetime.datetime.now(datetime.timezone.utc).isoformat()
         new_proj = model.get_metadata(band_id=model.get_band_number(
             {"standard_name": "wind_speed"}))["grid_mapping"]
         metadata["history"] = metadata["history"] + \
@@ -467,20 +605,14 @@ class SARWind(Nansat, object):
         if len(old_metadata.keys()) == 1:
             return old_metadata
 
-        t0 = datetime.datetime.fromisoformat(
-            old_metadata["time_coverage_start"].replace("Z", "+00:00")
-        ).replace(tzinfo=pytz.timezone("utc"))
+        t0 = _parse_iso(old_metadata["time_coverage_start"]).replace(
+            tzinfo=datetime.timezone.utc)
         t0iso = t0.isoformat()
-        t1 = datetime.datetime.fromisoformat(
-            old_metadata["time_coverage_end"].replace("Z", "+00:00")
-        ).replace(tzinfo=pytz.timezone("utc"))
+        t1 = _parse_iso(old_metadata["time_coverage_end"]).replace(
+            tzinfo=datetime.timezone.utc)
         t1iso = t1.isoformat()
 
         sar_filename = old_metadata["sar_filename"].split("/")[-1]
-        platforms = {
-            "S1A": ["Sentinel-1A", "SAR-C"],
-            "S1B": ["Sentinel-1B", "SAR-C"],
-        }
 
         def check_replace(key, in_dict, default_value):
             """Check if key is in in_dict. Return its value if it is
@@ -493,10 +625,8 @@ class SARWind(Nansat, object):
 
         # Get image boundary
         lon, lat = self.get_border()
-        boundary = "POLYGON (("
-        for la, lo in list(zip(lat, lon)):
-            boundary += "%.2f %.2f, " % (la, lo)
-        boundary = boundary[:-2]+"))"
+        boundary = "POLYGON ((%s))" % ", ".join(
+            "%.2f %.2f" % (la, lo) for la, lo in zip(lat, lon))
 
         """Set global CF metadata.
         """
@@ -518,9 +648,9 @@ class SARWind(Nansat, object):
         metadata["geospatial_lon_max"] = "%.2f" % lon.max()
         metadata["geospatial_lon_min"] = "%.2f" % lon.min()
         metadata["geospatial_bounds"] = boundary
-        metadata["platform"] = platforms[sar_filename[:3]][0]
+        metadata["platform"] = _PLATFORMS[sar_filename[:3]][0]
         metadata["platform_vocabulary"] = "https://vocab.met.no/mmd/Platform/Sentinel-1A"
-        metadata["instrument"] = platforms[sar_filename[:3]][1]
+        metadata["instrument"] = _PLATFORMS[sar_filename[:3]][1]
         metadata["instrument_vocabulary"] = "https://vocab.met.no/mmd/Instrument/SAR-C"
         metadata["source"] = "Space Borne Instrument"
         metadata["spatial_representation"] = "grid"
@@ -536,79 +666,19 @@ class SARWind(Nansat, object):
         date_created = "date_created"
         metadata[date_created] = check_replace(
             date_created, new_metadata,
-            datetime.datetime.utcnow().replace(tzinfo=pytz.timezone("utc")).isoformat())
+            datetime.datetime.now(datetime.timezone.utc).isoformat())
         title = "title"
         metadata[title] = check_replace(
             title, new_metadata, "Sea surface wind (10 m above sea "
             "level) estimated from {:s} NRCS, acquired on {:s}".format(
-                platforms[sar_filename[:3]][0], t0.strftime("%Y-%m-%d %H:%M:%S UTC")))
+                _PLATFORMS[sar_filename[:3]][0], t0.strftime("%Y-%m-%d %H:%M:%S UTC")))
         title_no = "title_no"
         metadata[title_no] = check_replace(
             title_no, new_metadata, "Overflatevind (10 moh) utledet"
-            " fra {:s} NRCS {:s}".format(platforms[sar_filename[:3]][0],
+            " fra {:s} NRCS {:s}".format(_PLATFORMS[sar_filename[:3]][0],
                                          t0.strftime("%Y-%m-%d %H:%M:%S UTC")))
-        summary = "summary"
-        metadata[summary] = check_replace(
-            summary, new_metadata, "Surface wind speed (10 m above "
-            "sea level) calculated from C-band Synthetic Aperture Radar (SAR) Normalized Radar "
-            "Cross Section (NRCS) and model forecast wind, using CMOD5n. The wind speed is "
-            "calculated for neutrally stable conditions and is equivalent to the wind stress.")
-        summary_no = "summary_no"
-        metadata[summary_no] = check_replace(
-            summary_no, new_metadata, "Overflatevind (10 moh) "
-            "beregnet fra SAR C-bånd tilbakespredning og vindretning fra varslingsmodell, ved "
-            "bruk av CMOD5n. Vindhastigheten er beregnet under antagelse av nøytral "
-            "atmosfærestabilitet, og er representativ for vindstress.")
-        license = "license"
-        metadata[license] = check_replace(license, new_metadata,
-                                          "https://spdx.org/licenses/CC-BY-4.0 (CC-BY-4.0)")
-        kw = "keywords"
-        metadata[kw] = check_replace(
-            kw, new_metadata,
-            "GCMDSK:EARTH SCIENCE > OCEANS > OCEAN WINDS > SURFACE WINDS > WIND SPEED, "
-            "GCMDSK:EARTH SCIENCE > OCEANS > OCEAN WINDS > WIND STRESS, "
-            "GEMET:Atmospheric conditions, "
-            "NORTHEMES:Vær og klima")
-        kw_voc = "keywords_vocabulary"
-        metadata[kw_voc] = check_replace(
-            kw_voc, new_metadata,
-            "GCMDSK:GCMD Science Keywords:https://vocab.met.no/GCMDSK, "
-            "GEMET:INSPIRE Themes:http://inspire.ec.europa.eu/theme, "
-            "NORTHEMES:GeoNorge Themes:https://register.geonorge.no/metadata-kodelister/"
-            "nasjonal-temainndeling")
-        refs = "references"
-        metadata[refs] = check_replace(refs, new_metadata,
-                                       "https://doi.org/10.1029/2006JC003743 (Scientific "
-                                       "publication)")
-        proc_level = "processing_level"
-        metadata[proc_level] = check_replace(proc_level, new_metadata, "Operational")
-
-        nauth = "naming_authority"
-        metadata[nauth] = check_replace(nauth, new_metadata, "no.met")
-        ptype = "publisher_type"
-        metadata[ptype] = check_replace(ptype, new_metadata, "institution")
-        pmail = "publisher_email"
-        metadata[pmail] = check_replace(pmail, new_metadata, "data-management-group@met.no")
-
-        publ_url = "publisher_url"
-        metadata[publ_url] = check_replace(publ_url, new_metadata, "https://www.met.no/")
-        publ_name = "publisher_name"
-        metadata[publ_name] = check_replace(publ_name, new_metadata,
-                                            "Norwegian Meteorological Institute")
-        insti = "institution"
-        metadata[insti] = check_replace(insti, new_metadata,
-                                        "Norwegian Meteorological Institute (MET Norway)")
-        access_const = "access_constraint"
-        metadata[access_const] = check_replace(access_const, new_metadata, "Open")
-        ds_prod_stat = "dataset_production_status"
-        metadata[ds_prod_stat] = check_replace(ds_prod_stat, new_metadata, "Complete")
-        proj = "project"
-        metadata[proj] = check_replace(proj, new_metadata,
-                                       "Svalbard Integrated Arctic Earth Observing System – "
-                                       "Infrastructure development of the Norwegian node "
-                                       "(SIOS-InfraNor)")
-        qual = "quality_control"
-        metadata[qual] = check_replace(qual, new_metadata, "No quality control")
+        for key, default_value in _DEFAULT_METADATA.items():
+            metadata[key] = check_replace(key, new_metadata, default_value)
 
         # This must be provided as input
         metadata["creator_type"] = new_metadata.pop("creator_type", "")
@@ -32,7 +32,8 @@ import argparse
 import datetime
 
 from pathlib import Path
-from pytz import timezone
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
 
 from py_mmd_tools.nc_to_mmd import Nc_to_mmd
 
@@ -51,7 +52,7 @@ def create_parser():
     parser.add_argument(
         "-t", "--time",
         type=str,
-        default=datetime.datetime.utcnow().replace(tzinfo=timezone("utc")).isoformat(),
+        default=datetime.datetime.now(datetime.timezone.utc).isoformat(),
         help="Central time of SAR data search (ISO format)."
     )
     parser.add_argument(
@@ -100,6 +101,11 @@ def create_parser():
         "--log_file", type=str, default="process-sar-wind.log",
         help="Log file name."
     )
+    parser.add_argument(
+        "--max_workers", type=int, default=1,
+        help="Number of worker processes used to process SAR datasets "
+             "concurrently (default is 1)."
+    )
 
     return parser
 
@@ -109,10 +115,16 @@ def process(url, model, output_path, fn_ending):
     """
     try:
         w = SARWind(url, model)
-    except Exception as ee:
+    except ValueError as ee:
+        # SARWind raises ValueError for datasets that cannot be used
+        # (e.g., no overlap or too large time difference)
         filename = None
         logging.error("Processing of %s and %s failed with message: "
                       "%s" % (url, model, str(ee)))
+    except Exception as ee:
+        filename = None
+        logging.exception("Processing of %s and %s failed with unexpected error: "
+                          "%s" % (url, model, str(ee)))
     else:
         basename = os.path.basename(w.filename).split(".")[0]
         time = datetime.datetime.fromisoformat(
@@ -172,62 +184,109 @@ def export_metadata(nc_file, base_url, collection="METNCS", **kwargs):
 
 def main(args=None):
     process_sar_wind(args.time, args.delta, args.processed_files, args.swath_path, args.export_mmd,
-                     args.odap_target_url, args.parent_mmd, args.log_to_file, args.log_file)
+                     args.odap_target_url, args.parent_mmd, args.log_to_file, args.log_file,
+                     args.max_workers)
+
+
+def process_url(url, swath_path, export_mmd=False, odap_target_url=None, parent_mmd=None):
+    """Process SAR wind from the dataset at the given url, using all
+    collocated weather forecast models. Return a list of records,
+    "Processed <url> and <model url>: <filename>", for the list of
+    processed datasets.
+    """
+    records = []
+    fna = None
+    fnm = None
+    meps, arome = collocate(url)
+    if meps is not None:
+        fnm = process_with_meps(url, meps, swath_path)
+    if arome is not None:
+        fna = process_with_arome(url, arome, swath_path)
+    if fnm is not None:
+        logging.info("Processed %s:%s" % (url, fnm))
+        if export_mmd:
+            statusm, msgm = export_metadata(fnm, odap_target_url, parent=parent_mmd)
+        records.append("Processed %s and %s: %s\n" % (url, meps, fnm))
+    if fna is not None:
+        logging.info("Processed %s:%s" % (url, fna))
+        if export_mmd:
+            statusa, msga = export_metadata(fna, odap_target_url, parent=parent_mmd)
+        records.append("Processed %s and %s: %s\n" % (url, arome, fna))
+    return records
 
 
 def process_sar_wind(time, delta, processed_files, swath_path, export_mmd=False,
-                     odap_target_url=None, parent_mmd=None, log_to_file=False, log_file=None):
+                     odap_target_url=None, parent_mmd=None, log_to_file=False, log_file=None,
+                     max_workers=1):
     """Run tools to process wind from SAR. Currently MEPS and
     AROME-ARCTIC weather forecast models are used for wind directions.
     If a SAR image overlaps with both model domains, two SAR wind
     fields will be processed.
+
+    If max_workers is larger than 1, the SAR datasets are processed
+    by a pool of max_workers processes. Separate processes are used
+    rather than threads since the netCDF-C library is not
+    thread-safe. Only this process writes to the list of processed
+    datasets. Datasets that fail are logged and left out of the list,
+    so they are retried in the next run.
     """
     if log_to_file:
         logging.basicConfig(filename=log_file, level=logging.DEBUG)
 
-    sar_urls0 = get_sar(time=datetime.datetime.fromisoformat(time), dt=delta)
-    processed_urls = ""
+    # The urls returned by get_sar are unique
+    sar_urls = get_sar(time=datetime.datetime.fromisoformat(time), dt=delta)
+    # One record per line, formatted as
+    # "Processed <url> and <model url>: <filename>"
+    processed_urls = set()
     if os.path.isfile(processed_files):
         with open(processed_files, "r") as fp:
-            lines = fp.readlines()
-        for line in lines:
-            if "Processed" in line:
-                processed_urls = "; ".join([processed_urls, line])
-
-    count = 0
-    # Avoid duplicate processing
-    sar_urls = []
-    for url in sar_urls0:
-        if url not in sar_urls:
-            sar_urls.append(url)
+            for line in fp:
+                if line.startswith("Processed "):
+                    processed_urls.add(line.split(" ")[1])
 
-    fna = None
-    fnm = None
+    urls = []
     for url in sar_urls:
         if url in processed_urls:
             logging.info("Already processed: %s" % url)
-            continue
-        meps, arome = collocate(url)
-        if meps is not None:
-            fnm = process_with_meps(url, meps, swath_path)
-        if arome is not None:
-            fna = process_with_arome(url, arome, swath_path)
-        if fnm is not None:
-            logging.info("Processed %s:%s" % (url, fnm))
-            if export_mmd:
-                statusm, msgm = export_metadata(fnm, odap_target_url, parent=parent_mmd)
-            with open(processed_files, "a") as fp:
-                fp.write("Processed %s and %s: %s\n\n" % (url, meps, fnm))
-        if fna is not None:
-            logging.info("Processed %s:%s" % (url, fna))
-            if export_mmd:
-                statusa, msga = export_metadata(fna, odap_target_url, parent=parent_mmd)
-            with open(processed_files, "a") as fp:
-                fp.write("Processed %s and %s: %s\n\n" % (url, arome, fna))
+        else:
+            urls.append(url)
+
+    count = 0
+    for records in _process_urls(urls, max_workers, swath_path, export_mmd, odap_target_url,
+                                 parent_mmd):
+        with open(processed_files, "a") as fp:
+            fp.writelines(records)
         count += 1
         logging.info("%d/%d done" % (count, len(sar_urls)))
 
 
+def _process_urls(urls, max_workers, *args):
+    """Call process_url for each url, and yield the records of each
+    url as it is done. A url that fails is logged and yields no
+    records. With max_workers=1, the urls are processed in this
+    process, otherwise in a pool of max_workers processes.
+    """
+    if max_workers == 1:
+        for url in urls:
+            try:
+                records = process_url(url, *args)
+            except Exception:
+                logging.exception("Processing of %s failed" % url)
+                records = []
+            yield records
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(process_url, url, *args): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                records = future.result()
+            except Exception:
+                logging.exception("Processing of %s failed" % futures[future])
+                records = []
+            yield records
+
+
 def _main():  # pragma: no cover
     main(create_parser().parse_args())  # entry point in setup.cfg
 
@@ -12,7 +12,6 @@ met-sar-vind is licensed under the Apache License 2.0
 
 """
 import os
-import pytz
 import uuid
 import logging
 import netCDF4
@@ -106,7 +105,7 @@ def reproject_swath_dataset_and_export_mmd(sarwind, reprojected_path, parent_mmd
     else:
         # Export
         n.export2thredds(full_path, time=time)
-        created = datetime.datetime.now(pytz.timezone("utc")).isoformat()
+        created = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
         # Copy and update metadata
         ds = netCDF4.Dataset(full_path, "a")
@@ -4,8 +4,8 @@ from fadg.find_and_collocate import Meps
 
 
 def get_sar(time=None, dt=24, bbox=None, endpoint="https://nbs.csw.met.no/csw"):
-    """Get Sentinel-1 A and B datasets at the given time +/- dt
-    hours.
+    """Get the OPeNDAP urls of unique Sentinel-1 A and B datasets at
+    the given time +/- dt hours.
 
     Input
     =====
@@ -25,12 +25,9 @@ def get_sar(time=None, dt=24, bbox=None, endpoint="https://nbs.csw.met.no/csw"):
     # Find all Sentinel-1 data dt/2 hours back in time from now:
     sar = SearchCSW(time=time, dt=dt, text=text, endpoint=endpoint)
 
-    urls = []
-    for url in sar.urls:
-        if "S1A" in url or "S1B" in url:
-            urls.append(url)
-
-    return urls
+    # Keep Sentinel-1 A and B datasets, without duplicates (dict keys
+    # keep the search order)
+    return list(dict.fromkeys(url for url in sar.urls if "S1A" in url or "S1B" in url))
 
 
 def collocate(url, endpoint="https://data.csw.met.no"):
@@ -0,0 +1,123 @@
+import pytest
+
+import numpy as np
+
+from sarwind.cmod5n import cmod5n_forward
+from sarwind.cmod5n import cmod5n_inverse
+
+
+def reference_cmod5n_inverse(sigma0_obs, phi, incidence, iterations=10):
+    """ The original, unblocked, double precision CMOD5n inversion.
+    """
+    v = np.array([10.]) * np.ones(sigma0_obs.shape)
+    step = 10.
+    for iterno in range(1, iterations):
+        sigma0_calc = cmod5n_forward(v, phi, incidence)
+        ind = sigma0_calc - sigma0_obs > 0
+        v = v + step
+        v[ind] = v[ind] - 2 * step
+        step = step / 2
+    return v
+
+
+@pytest.fixture(scope="module")
+def cmod_input():
+    """ NRCS, look relative wind direction and incidence angle for a
+    range of wind speeds.
+    """
+    rng = np.random.default_rng(0)
+    shape = (200, 300)
+    wind_speed = rng.uniform(1, 25, shape)
+    phi = rng.uniform(0, 360, shape)
+    incidence = rng.uniform(19, 47, shape)
+    sigma0 = cmod5n_forward(wind_speed, phi, incidence)
+    return sigma0, phi, incidence
+
+
+@pytest.mark.without_nansat
+def test_cmod5n_inverse_float64(cmod_input):
+    """ Test that double precision input gives the same result as the
+    original implementation.
+    """
+    sigma0, phi, incidence = cmod_input
+    v = cmod5n_inverse(sigma0, phi, incidence)
+    assert v.dtype == np.float64
+    np.testing.assert_array_equal(v, reference_cmod5n_inverse(sigma0, phi, incidence))
+
+
+@pytest.mark.without_nansat
+def test_cmod5n_inverse_float32(cmod_input):
+    """ Test that single precision input gives a single precision
+    result within 0.1 m/s of the double precision result.
+    """
+    sigma0, phi, incidence = cmod_input
+    v64 = cmod5n_inverse(sigma0, phi, incidence)
+    v32 = cmod5n_inverse(sigma0.astype(np.float32), phi.astype(np.float32),
+                         incidence.astype(np.float32))
+    assert v32.dtype == np.float32
+    assert np.abs(v32 - v64).max() < 0.1
+
+
+@pytest.mark.without_nansat
+def test_cmod5n_inverse_dtype(cmod_input):
+    """ Test that the output is in double precision if any input is.
+    """
+    sigma0, phi, incidence = cmod_input
+    v = cmod5n_inverse(sigma0.astype(np.float32), phi.astype(np.float32), incidence)
+    assert v.dtype == np.float64
+    v = cmod5n_inverse(sigma0.astype(np.float32), phi.astype(np.float32),
+                       np.round(incidence).astype(np.int16))
+    assert v.dtype == np.float32
+
+
+@pytest.mark.without_nansat
+@pytest.mark.parametrize("shape, block_size", [
+    ((1000,), 64),     # 1-D input, block not a multiple of the length
+    ((7, 50), 10),     # block smaller than one row
+    ((13, 20), 60),    # number of rows not a multiple of block rows
+    ((20, 15), 300),   # one block
+    ((0,), 64),        # empty input
+    ((0, 5), 64),      # empty input
+])
+def test_cmod5n_inverse_blocks(cmod_input, shape, block_size):
+    """ Test that the result does not depend on the block size.
+    """
+    sigma0, phi, incidence = (a.ravel()[:np.prod(shape)].reshape(shape) for a in cmod_input)
+    v = cmod5n_inverse(sigma0, phi, incidence, block_size=block_size)
+    assert v.shape == shape
+    np.testing.assert_array_equal(
+        v, cmod5n_inverse(sigma0, phi, incidence, block_size=max(1, sigma0.size)))
+
+
+@pytest.mark.without_nansat
+@pytest.mark.parametrize("block_size", [1, 45, 1000])
+def test_cmod5n_inverse_broadcast(cmod_input, block_size):
+    """ Test blocked inversion with wind direction and incidence angle
+    arrays that are broadcast to the NRCS grid.
+    """
+    sigma0 = cmod_input[0][:30, :40]
+    phi = cmod_input[1][0, :40]
+    incidence = cmod_input[2][:30, :1]
+    v = cmod5n_inverse(sigma0, phi, incidence, block_size=block_size)
+    assert v.shape == sigma0.shape
+    np.testing.assert_array_equal(
+        v, cmod5n_inverse(sigma0, phi, incidence, block_size=sigma0.size))
+    np.testing.assert_array_equal(v, reference_cmod5n_inverse(
+        sigma0, *np.broadcast_arrays(phi, incidence, sigma0)[:2]))
+
+
+@pytest.mark.without_nansat
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_cmod5n_inverse_nan_and_land(dtype):
+    """ Test that NaN and land-like (very bright or infinite) NRCS end
+    at the upper bound of the search, 10 + 19.9609375 m/s, and zero
+    NRCS at the lower bound, as in the original implementation.
+    SARWind therefore leaves out land and non-finite NRCS before the
+    inversion (see SARWind.calculate_wind_speed).
+    """
+    sigma0 = np.array([np.nan, np.inf, 1., 0.], dtype=dtype)
+    phi = np.full(sigma0.shape, 45., dtype=dtype)
+    incidence = np.full(sigma0.shape, 30., dtype=dtype)
+    v = cmod5n_inverse(sigma0, phi, incidence)
+    np.testing.assert_array_equal(v, [29.9609375, 29.9609375, 29.9609375, 0.0390625])
+    np.testing.assert_array_equal(v, reference_cmod5n_inverse(sigma0, phi, incidence))
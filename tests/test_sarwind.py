@@ -67,7 +67,7 @@ def testSARWind_using_s1EWnc_arome_filenames(mock_nansat, sarEW_NBS, arome, monk
         smock.side_effect = [
             np.array([1, 1]),           # self[self.sigma0_bandNo]
             np.array([0, 0]),           # topo[1]
-            1,                          # self[self.sigma0_bandNo]
+            np.array([30, 30]),         # self["incidence_angle"]
         ]
         mp.setattr("sarwind.sarwind.Nansat.__getitem__", smock)
         mp.setattr("sarwind.sarwind.Nansat.intersects", lambda *a, **k: False)
@@ -103,6 +103,36 @@ def testSARWind_using_s1EWnc_arome_filenames(mock_nansat, sarEW_NBS, arome, monk
         assert str(ee.value) == "Erroneous SAR product - all NRCS values are NaN."
 
 
+@pytest.mark.skipif(nansat_installed, reason="Only works when nansat is not installed")
+@pytest.mark.without_nansat
+def testSARWind_time_difference_of_days(mock_nansat, sarEW_NBS, arome, monkeypatch):
+    """ Test that a model field one day and a few seconds from the SAR
+    acquisition is rejected, i.e., that whole days are included in the
+    time difference.
+    """
+    from sarwind.sarwind import SARWind
+    with monkeypatch.context() as mp:
+        smock = SelectMock()
+        smock.side_effect = [
+            np.array([1, 1]),           # self[self.sigma0_bandNo]
+            np.array([0, 0]),           # topo[1]
+            np.array([30, 30]),         # self["incidence_angle"]
+        ]
+        mp.setattr("sarwind.sarwind.Nansat.__getitem__", smock)
+        mp.setattr("sarwind.sarwind.Nansat.intersects", lambda *a, **k: False)
+        smock2 = SelectMock()
+        smock2.side_effect = [
+            "VV",
+            "2024-04-04T23:28:31+00:00",
+            "2024-04-04T23:28:51+00:00",
+            "2024-04-03T23:28:31+00:00",
+        ]
+        mp.setattr("sarwind.sarwind.Nansat.get_metadata", smock2)
+        with pytest.raises(ValueError) as ee:
+            SARWind(sarEW_NBS, arome)
+        assert "Time difference between model and SAR wind field is greater" in str(ee.value)
+
+
 @pytest.mark.without_nansat
 def testSARWind_get_model_wind_field(mock_nansat, arome, monkeypatch):
     """
@@ -126,6 +156,49 @@ def testSARWind_get_model_wind_field(mock_nansat, arome, monkeypatch):
         assert not np.isnan(dir).all()
 
 
+@pytest.mark.skipif(nansat_installed, reason="Only works when nansat is not installed")
+@pytest.mark.without_nansat
+def testSARWind_get_land_mask_cache(mock_nansat, tmpDir, monkeypatch):
+    """ Test that the land mask is read from the cache when the same
+    SAR grid is processed again.
+    """
+    from sarwind.sarwind import SARWind
+
+    with monkeypatch.context() as mp:
+        mp.setenv("SARWIND_LANDMASK_CACHE", tmpDir)
+        mp.setattr(SARWind, "__init__", lambda *a, **kw: None)
+        mp.setattr(SARWind, "get_border", lambda *a, **k: ([1, 2], [3, 4]), raising=False)
+        mp.setattr(SARWind, "shape", lambda *a, **k: (2,), raising=False)
+        smock = SelectMock()
+        smock.side_effect = [
+            np.array([0, 1]),           # topo[1]
+            np.array([1, 0]),           # topo[1]
+            np.array([0, 0]),           # topo[1]
+        ]
+        mp.setattr("sarwind.sarwind.Nansat.__getitem__", smock)
+        w = SARWind("sar_image", "wind")
+
+        land = w.get_land_mask()
+        assert land.tolist() == [False, True]
+        assert len([fn for fn in os.listdir(tmpDir) if fn.startswith("landmask_")]) == 1
+
+        # The topography is not read again
+        land = w.get_land_mask()
+        assert land.tolist() == [False, True]
+        assert smock.call_count == 1
+
+        # Footprints that only differ beyond the printed precision of
+        # numpy arrays get separate masks
+        lon = np.linspace(0, 1, 2000)
+        mp.setattr(SARWind, "get_border", lambda *a, **k: (lon, lon), raising=False)
+        assert w.get_land_mask().tolist() == [True, False]
+        lon = lon.copy()
+        lon[1000] += 1e-9
+        assert w.get_land_mask().tolist() == [False, False]
+        assert smock.call_count == 3
+        assert len([fn for fn in os.listdir(tmpDir) if fn.startswith("landmask_")]) == 3
+
+
 @pytest.mark.skipif(nansat_installed, reason="Only works when nansat is not installed")
 @pytest.mark.without_nansat
 def testSARWind_set_related_dataset(mock_nansat, monkeypatch):
@@ -327,6 +400,26 @@ def testSARWind_export(monkeypatch, sarIW_SAFE, meps):
     assert not os.path.isfile(fp.name)
 
 
+@pytest.mark.skipif(not nansat_installed, reason="Only works when nansat is installed")
+def testSARWind_export_compression(sarIW_SAFE, meps):
+    """ Test that the exported NetCDF-4 file is deflate compressed by
+    default, and that given GDAL options replace the defaults.
+    """
+    from sarwind.sarwind import SARWind
+    w = SARWind(sarIW_SAFE, meps)
+    metadata = {"title": "Sea surface wind"}
+    with tempfile.NamedTemporaryFile(delete=True) as fp:
+        w.export(filename=fp.name, metadata=metadata)
+        with netCDF4.Dataset(fp.name) as ds:
+            assert ds.data_model == "NETCDF4"
+            assert ds.variables["windspeed"].filters()["zlib"] is True
+    with tempfile.NamedTemporaryFile(delete=True) as fp:
+        w.export(filename=fp.name, metadata=metadata, options="FORMAT=NC4")
+        with netCDF4.Dataset(fp.name) as ds:
+            assert ds.data_model == "NETCDF4"
+            assert ds.variables["windspeed"].filters()["zlib"] is False
+
+
 @pytest.mark.skipif(not nansat_installed, reason="Only works when nansat is installed")
 def testSARWind_using_s1IWDV_meps_filenames(sarIW_SAFE, meps):
     """ Test that wind is generated from Sentinel-1 data in IW-mode,
@@ -340,6 +433,28 @@ def testSARWind_using_s1IWDV_meps_filenames(sarIW_SAFE, meps):
     assert isinstance(w, SARWind)
 
 
+@pytest.mark.without_nansat
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def testSARWind_calculate_wind_speed(dtype):
+    """ Test that the wind speed is NaN over land and where the input
+    is not finite, and calculated with CMOD5n elsewhere.
+    """
+    from sarwind.sarwind import SARWind
+    from sarwind.cmod5n import cmod5n_forward
+    s0vv = cmod5n_forward(np.full(6, 8.), np.full(6, 45.), np.full(6, 30.)).astype(dtype)
+    s0vv[1] = np.nan
+    s0vv[2] = np.inf
+    look_relative_wind_direction = np.full(6, 45., dtype=dtype)
+    look_relative_wind_direction[3] = np.nan
+    inc = np.full(6, 30., dtype=dtype)
+    inc[4] = np.nan
+    land = np.array([False, False, False, False, False, True])
+    windspeed = SARWind.calculate_wind_speed(s0vv, look_relative_wind_direction, inc, land)
+    assert windspeed.dtype == dtype
+    assert np.isnan(windspeed[1:]).all()
+    assert np.abs(windspeed[0] - 8.) < 0.1
+
+
 @pytest.mark.without_nansat
 def testSARWind_calculate_wind_from_direction():
     """ Test that the wind direction becomes correct.
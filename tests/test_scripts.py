@@ -2,10 +2,12 @@ import os
 import pytest
 import logging
 import datetime
+import functools
 import tempfile
+import multiprocessing
 
-from pytz import timezone
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
 
 from py_mmd_tools.nc_to_mmd import Nc_to_mmd
 
@@ -18,6 +20,7 @@ else:
     from sarwind.sarwind import SARWind
     from sarwind.script.process_sar_wind import main
     from sarwind.script.process_sar_wind import process
+    from sarwind.script.process_sar_wind import process_url
     from sarwind.script.process_sar_wind import create_parser
     from sarwind.script.process_sar_wind import process_with_meps
     from sarwind.script.process_sar_wind import process_with_arome
@@ -113,7 +116,7 @@ def testProcess_sar_wind_main(monkeypatch, caplog):
     """Test main function of the process_sar_wind script.
     """
     caplog.set_level(logging.INFO)
-    sar_urls = ["/path/to/sar/fn.nc", "/path/to/sar/fn.nc", "/path/to/sar/fn2.nc"]
+    sar_urls = ["/path/to/sar/fn.nc", "/path/to/sar/fn2.nc"]
     meps = "https://opendap.url.no/of/a/meps/dataset.nc"
     arome = "https://opendap.url.no/of/a/arome/dataset.nc"
     out_fn_meps = "./2024/03/23/sar_meps_wind.nc"
@@ -122,7 +125,7 @@ def testProcess_sar_wind_main(monkeypatch, caplog):
     class MockArgs:
         pass
     args = MockArgs()
-    args.time = datetime.datetime.now(timezone("utc")).isoformat()
+    args.time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     args.delta = 24
     args.swath_path = "/path/to/out"
     args.export_mmd = True
@@ -131,6 +134,7 @@ def testProcess_sar_wind_main(monkeypatch, caplog):
     args.log_to_file = False
     args.log_file = None
     args.parent_mmd = None
+    args.max_workers = 1
     with monkeypatch.context() as mp:
         mp.setattr("sarwind.script.process_sar_wind.get_sar",
                    lambda *a, **k: sar_urls)
@@ -151,7 +155,7 @@ def testProcess_sar_wind_main(monkeypatch, caplog):
             assert os.path.isfile(fp.name)
             lines = fp.readlines()
             assert "./2024/03/23/sar_meps_wind.nc" in str(lines[0])
-            assert "./2024/03/23/sar_arome_wind.nc" in str(lines[2])
+            assert "./2024/03/23/sar_arome_wind.nc" in str(lines[1])
             main(args)
             assert "Already processed" in caplog.text
             for handler in logging.root.handlers[:]:
@@ -166,6 +170,126 @@ def testProcess_sar_wind_main(monkeypatch, caplog):
         assert not os.path.isfile(fp.name)
 
 
+@pytest.mark.skipif(not nansat_installed, reason="Only works when nansat is installed")
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(),
+                    reason="The mocks only reach forked worker processes")
+def testProcess_sar_wind_main_max_workers(monkeypatch):
+    """Test that each processed file is listed exactly once when the
+    SAR datasets are processed by several worker processes.
+    """
+    sar_urls = ["/path/to/sar/fn%d.nc" % i for i in range(5)]
+    meps = "https://opendap.url.no/of/a/meps/dataset.nc"
+    arome = "https://opendap.url.no/of/a/arome/dataset.nc"
+
+    class MockArgs:
+        pass
+    args = MockArgs()
+    args.time = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    args.delta = 24
+    args.swath_path = "/path/to/out"
+    args.export_mmd = False
+    args.odap_target_url = None
+    args.log_to_file = False
+    args.log_file = None
+    args.parent_mmd = None
+    args.max_workers = 3
+    with monkeypatch.context() as mp:
+        # The workers must be forked to inherit the mocks below
+        mp.setattr("sarwind.script.process_sar_wind.ProcessPoolExecutor",
+                   functools.partial(ProcessPoolExecutor,
+                                     mp_context=multiprocessing.get_context("fork")))
+        mp.setattr("sarwind.script.process_sar_wind.get_sar",
+                   lambda *a, **k: sar_urls)
+        mp.setattr("sarwind.script.process_sar_wind.collocate",
+                   lambda *a, **k: (meps, arome))
+        mp.setattr("sarwind.script.process_sar_wind.process_with_meps",
+                   lambda url, *a, **k: url.replace(".nc", "_meps_wind.nc"))
+        mp.setattr("sarwind.script.process_sar_wind.process_with_arome",
+                   lambda url, *a, **k: url.replace(".nc", "_arome_wind.nc"))
+        with tempfile.NamedTemporaryFile(mode="r", delete=True) as fp:
+            args.processed_files = fp.name
+            main(args)
+            lines = fp.readlines()
+    assert len(lines) == 2*len(sar_urls)
+    expected = set()
+    for url in sar_urls:
+        expected.add("Processed %s and %s: %s\n" % (
+            url, meps, url.replace(".nc", "_meps_wind.nc")))
+        expected.add("Processed %s and %s: %s\n" % (
+            url, arome, url.replace(".nc", "_arome_wind.nc")))
+    assert set(lines) == expected
+
+
+@pytest.mark.skipif(not nansat_installed, reason="Only works when nansat is installed")
+@pytest.mark.parametrize("max_workers", [
+    1,
+    pytest.param(2, marks=pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="The mocks only reach forked worker processes")),
+])
+def testProcess_sar_wind_main_failing_url(monkeypatch, caplog, max_workers):
+    """Test that the other datasets are listed as processed when the
+    processing of one of them fails, both in this process and in
+    worker processes.
+    """
+    caplog.set_level(logging.INFO)
+    sar_urls = ["/path/to/sar/fn%d.nc" % i for i in range(4)]
+    meps = "https://opendap.url.no/of/a/meps/dataset.nc"
+
+    def collocate(url):
+        if url == sar_urls[1]:
+            raise RuntimeError("Collocation failed")
+        return meps, None
+
+    class MockArgs:
+        pass
+    args = MockArgs()
+    args.time = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    args.delta = 24
+    args.swath_path = "/path/to/out"
+    args.export_mmd = False
+    args.odap_target_url = None
+    args.log_to_file = False
+    args.log_file = None
+    args.parent_mmd = None
+    args.max_workers = max_workers
+    with monkeypatch.context() as mp:
+        if max_workers > 1:
+            # The workers must be forked to inherit the mocks below
+            mp.setattr("sarwind.script.process_sar_wind.ProcessPoolExecutor",
+                       functools.partial(ProcessPoolExecutor,
+                                         mp_context=multiprocessing.get_context("fork")))
+        mp.setattr("sarwind.script.process_sar_wind.get_sar",
+                   lambda *a, **k: sar_urls)
+        mp.setattr("sarwind.script.process_sar_wind.collocate", collocate)
+        mp.setattr("sarwind.script.process_sar_wind.process_with_meps",
+                   lambda url, *a, **k: url.replace(".nc", "_meps_wind.nc"))
+        with tempfile.NamedTemporaryFile(mode="r", delete=True) as fp:
+            args.processed_files = fp.name
+            main(args)
+            lines = fp.readlines()
+    assert "Processing of %s failed" % sar_urls[1] in caplog.text
+    assert sorted(line.split(" ")[1] for line in lines) == [
+        sar_urls[0], sar_urls[2], sar_urls[3]]
+
+
+@pytest.mark.skipif(not nansat_installed, reason="Only works when nansat is installed")
+def testProcess_sar_wind_process_url(monkeypatch):
+    """Test that process_url only lists the filenames processed for
+    the given url.
+    """
+    meps = "https://opendap.url.no/of/a/meps/dataset.nc"
+    out_fn_meps = "./2024/03/23/sar_meps_wind.nc"
+    with monkeypatch.context() as mp:
+        mp.setattr("sarwind.script.process_sar_wind.collocate",
+                   lambda *a, **k: (meps, None))
+        mp.setattr("sarwind.script.process_sar_wind.process_with_meps",
+                   lambda *a, **k: out_fn_meps)
+        records = process_url("/path/to/sar/fn.nc", "/path/to/out")
+        assert len(records) == 1
+        assert out_fn_meps in records[0]
+
+
 @pytest.mark.skipif(not nansat_installed, reason="Only works when nansat is installed")
 def test_reproject_and_export(meps_20240416, s1a_20240416, monkeypatch, caplog):
     """Test script to reproject and export new dataset.
@@ -21,9 +21,9 @@ def test_get_sar(monkeypatch):
         "S1A_IW_GRDM_1SDV_20240421T155133_20240421T155200_053534_067F5F_06E5.nc"]
     with monkeypatch.context() as mp:
         mp.setattr(SearchCSW, "__init__", lambda *a, **k: None)
-        mp.setattr(SearchCSW, "__getattribute__", lambda *a, **k: urls)
+        mp.setattr(SearchCSW, "__getattribute__", lambda *a, **k: urls + urls[:1])
         sar_urls = get_sar()
-        assert sar_urls[0] == urls[0]
+        assert sar_urls == urls
 
 
 @pytest.mark.sarwind